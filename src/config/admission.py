@@ -0,0 +1,27 @@
+from os import getenv
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+# Admission control configuration per route class.
+# Each class gets a fixed number of concurrent requests, a bounded wait queue
+# and a maximum time a request may wait in that queue before it is shed.
+ADMISSION_CONFIG = {
+    # Snowflake extraction / Neo4j ingestion and graph export/import routes
+    "bulk": {
+        "prefixes": ["/extract-metadata", "/persist-metadata", "/graph/export", "/graph/import"],
+        "max_concurrency": int(getenv("ADMISSION_BULK_CONCURRENCY", "2")),
+        "max_queue": int(getenv("ADMISSION_BULK_QUEUE", "4")),
+        "queue_timeout": float(getenv("ADMISSION_BULK_QUEUE_TIMEOUT", "5")),
+        "retry_after": int(getenv("ADMISSION_BULK_RETRY_AFTER", "30")),
+    },
+    # Everything else (CRUD, search, point lookups)
+    "default": {
+        "prefixes": [],
+        "max_concurrency": int(getenv("ADMISSION_DEFAULT_CONCURRENCY", "32")),
+        "max_queue": int(getenv("ADMISSION_DEFAULT_QUEUE", "64")),
+        "queue_timeout": float(getenv("ADMISSION_DEFAULT_QUEUE_TIMEOUT", "2")),
+        "retry_after": int(getenv("ADMISSION_DEFAULT_RETRY_AFTER", "1")),
+    },
+}
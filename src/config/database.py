@@ -17,6 +17,17 @@ class Neo4jConnection:
         with self.driver.session() as session:
             result = session.run(query, parameters)
             return [record for record in result]
+
+    def stream(self, query: str, parameters: dict = {}):
+        # Yields records as they arrive instead of materialising the whole result
+        with self.driver.session() as session:
+            for record in session.run(query, parameters):
+                yield record
+
+    def execute_write(self, query: str, parameters: dict = {}):
+        # Runs the query in a managed write transaction (retried on transient errors)
+        with self.driver.session() as session:
+            return session.execute_write(lambda tx: [record for record in tx.run(query, parameters)])
         
 
 # Dependency to get a Neo4j connection
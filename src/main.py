@@ -1,7 +1,11 @@
 from fastapi import FastAPI, Depends, HTTPException
 from fastapi.responses import JSONResponse
 from .middlewares.cors import add_cors_middleware
-from .routes import tables, columns, rules, metadata
+from .middlewares.admission import add_admission_middleware, get_admission_metrics
+from .routes import tables, columns, rules, metadata, lineage, similarity, transfer
+from .services.property_buffer import property_buffer, WRITE_BEHIND_ENABLED
+from .config.database import Neo4jConnection, NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD
+from .utils.catalog import create_catalog_indexes
 # from os import getenv as env
 from dotenv import load_dotenv
 
@@ -18,17 +22,47 @@ app.include_router(tables.router)
 app.include_router(columns.router)
 app.include_router(rules.router)
 app.include_router(metadata.router)
+app.include_router(lineage.router)
+app.include_router(similarity.router)
+app.include_router(transfer.router)
 
 
+add_admission_middleware(app)
 add_cors_middleware(app)
 
 # app.include_router(sample_router)
 
 
+@app.on_event("startup")
+def create_indexes():
+    # Id lookups on catalog nodes rely on these indexes
+    db = Neo4jConnection(NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD)
+    try:
+        create_catalog_indexes(db)
+    except Exception as e:
+        print(f"Could not create catalog indexes: {e}")
+    finally:
+        db.close()
+
+@app.on_event("startup")
+def start_property_buffer():
+    if WRITE_BEHIND_ENABLED:
+        property_buffer.start()
+
+@app.on_event("shutdown")
+def stop_property_buffer():
+    # Flush pending property updates before the process exits
+    property_buffer.stop()
+
+
 @app.get("/")
 async def root():
     return {"message": f"Hello, Fastapi Template Is Ready - {env['Environment']}"}
 
+@app.get("/admission/metrics")
+async def admission_metrics():
+    return get_admission_metrics()
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(_, exc):
     return JSONResponse(
@@ -0,0 +1,136 @@
+import asyncio
+from collections import deque
+from typing import Deque, Dict, Any
+from fastapi.responses import JSONResponse
+from src.config.admission import ADMISSION_CONFIG
+
+
+class RouteClassLimiter:
+    def __init__(self, name: str, max_concurrency: int, max_queue: int, queue_timeout: float, retry_after: int):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        # Requests waiting for a slot, in arrival order. A freed slot is handed straight
+        # to the oldest waiter (asyncio.Semaphore on Python 3.9 lets new arrivals barge in).
+        self.waiters: Deque[asyncio.Future] = deque()
+
+        # Metrics
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+
+    async def acquire(self) -> bool:
+        # Fast path: a slot is free and nobody is waiting for one
+        if not self.waiters and self.in_flight < self.max_concurrency:
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+
+        # Queue is full, shed the request right away
+        if len(self.waiters) >= self.max_queue:
+            self.rejected_queue_full += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        self.queued += 1
+        try:
+            # The slot is transferred by release(), in_flight already accounts for it
+            await asyncio.wait_for(waiter, timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected_timeout += 1
+            # A slot handed over just as the timeout fired must be passed on, not leaked
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            return False
+        finally:
+            self.queued -= 1
+            if waiter in self.waiters:
+                self.waiters.remove(waiter)
+
+        self.admitted += 1
+        return True
+
+    def release(self):
+        # Hand the slot to the oldest waiter still waiting, otherwise free it
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(True)
+                return
+        self.in_flight -= 1
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+        }
+
+
+class AdmissionControlMiddleware:
+    def __init__(self, app, config: Dict[str, Dict[str, Any]]):
+        self.app = app
+        self.limiters = {
+            name: RouteClassLimiter(
+                name,
+                max_concurrency=settings["max_concurrency"],
+                max_queue=settings["max_queue"],
+                queue_timeout=settings["queue_timeout"],
+                retry_after=settings["retry_after"],
+            )
+            for name, settings in config.items()
+        }
+        self.prefixes = [
+            (prefix, name)
+            for name, settings in config.items()
+            for prefix in settings["prefixes"]
+        ]
+        limiter_registry.update(self.limiters)
+
+    def route_class(self, path: str) -> str:
+        for prefix, name in self.prefixes:
+            if path.startswith(prefix):
+                return name
+        return "default"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.limiters[self.route_class(scope["path"])]
+
+        if not await limiter.acquire():
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": f"Server busy, too many '{limiter.name}' requests"},
+                headers={"Retry-After": str(limiter.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+
+# Limiters of the installed middleware, exposed for the metrics endpoint
+limiter_registry: Dict[str, RouteClassLimiter] = {}
+
+
+def get_admission_metrics() -> Dict[str, Dict[str, Any]]:
+    return {name: limiter.metrics() for name, limiter in limiter_registry.items()}
+
+
+def add_admission_middleware(app):
+    app.add_middleware(AdmissionControlMiddleware, config=ADMISSION_CONFIG)
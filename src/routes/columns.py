@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from ..models.column import Column
 # from ....config.database import Neo4jConnection, get_db
 from src.config.database import Neo4jConnection, get_db
+from ..utils.etag import check_not_modified
+from ..services.subgraph_cache import subgraph_cache
+from ..services.similarity_index import column_index
 
 import uuid
 
@@ -18,22 +21,29 @@ def create_column(column: Column, table_id: uuid.UUID, db: Neo4jConnection = Dep
     query = """
         MATCH (t: Table {table_id: $table_id}) 
         CREATE (t) <-[r: column_of]- (c: Column {name: $name, column_id: $column_id, contextual_description: $contextual_description}) 
-        SET c += $dynamic_properties
+        SET c += $dynamic_properties, t.version = coalesce(t.version, 0) + 1, t.updated_at = timestamp()
         RETURN c.name, c.column_id, c.contextual_description;
     """
 
     dynamic_properties = {k: v for k, v in column.dynamic_properties.items() if isinstance(v, (str, int, float, bool, list))}
 
     result = db.query(query, {"table_id": str(table_id), "column_id": column_id, "name": column.name, "contextual_description": column.contextual_description, "dynamic_properties": dynamic_properties})
+    subgraph_cache.invalidate()
     
     if not result:
         raise HTTPException(status_code=400, detail="Failed to create column")
+
+    column_index.add(result[0]["c.column_id"], result[0]["c.name"], result[0]["c.contextual_description"])
     
     return {"column_id": result[0]["c.column_id"],"name": result[0]["c.name"], "contextual_description": result[0]["c.contextual_description"], **dynamic_properties}
 
 
 @router.get("/columns/{table_id}")
-def get_columns(table_id: uuid.UUID, db: Neo4jConnection = Depends(get_db)):
+def get_columns(table_id: uuid.UUID, request: Request, response: Response, db: Neo4jConnection = Depends(get_db)):
+
+    not_modified = check_not_modified(request, response, db, "table_id", str(table_id))
+    if not_modified:
+        return not_modified
 
     query = """MATCH (p:Column)-[r:column_of]-(t:Table {table_id: $table_id})
     RETURN p
@@ -67,13 +77,15 @@ def get_columns(table_id: uuid.UUID,column_id: uuid.UUID, db: Neo4jConnection =
 @router.delete("/columns/{table_id}/{column_id}")
 def delete_column(table_id: uuid.UUID, column_id: uuid.UUID, db: Neo4jConnection = Depends(get_db)):
 
-    db.query("""Match (t:Table {table_id: $table_id})-[r:column_of]-(c:Column {column_id: $column_id}) delete r""", {"table_id": str(table_id), "column_id": str(column_id)})
+    db.query("""Match (t:Table {table_id: $table_id})-[r:column_of]-(c:Column {column_id: $column_id}) SET t.version = coalesce(t.version, 0) + 1, t.updated_at = timestamp() delete r""", {"table_id": str(table_id), "column_id": str(column_id)})
 
     query = """MATCH (p:Column {column_id: $column_id})
     Delete p
     """
 
     result = db.query(query, {"column_id": str(column_id)})
+    subgraph_cache.invalidate()
+    column_index.remove(str(column_id))
     
     if result:
         raise HTTPException(status_code=400, detail="Failed to delete column")
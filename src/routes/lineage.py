@@ -0,0 +1,125 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from neo4j import Query as CypherQuery
+from neo4j.exceptions import ClientError
+from os import getenv
+from typing import List, Literal, Optional
+from src.config.database import Neo4jConnection, get_db
+from ..models.metadata import SearchResponse
+from ..services.subgraph_cache import subgraph_cache
+from ..utils.catalog import CATALOG_ID_PROPERTIES, CATALOG_LABELS, match_catalog_node
+
+router = APIRouter()
+
+
+# Relationship types and labels a traversal may use; they are interpolated into the query so must be whitelisted
+RELATIONSHIP_TYPES = {"CONTAINS", "column_of", "rule_of"}
+NODE_LABELS = set(CATALOG_LABELS)
+
+MAX_DEPTH = 6
+MAX_RESULTS = 1000
+# Upper bound on nodes expanded by one traversal, whatever the target label filter lets through
+MAX_EXPANDED = 5000
+# Server-side timeout (seconds) for each traversal query
+TRAVERSAL_TIMEOUT = float(getenv("TRAVERSAL_TIMEOUT", "10"))
+
+ID_PROPERTIES = {key for keys in CATALOG_ID_PROPERTIES.values() for key in keys}
+
+
+START_QUERY = match_catalog_node("start", "$node_id", id_properties=ID_PROPERTIES) + """
+RETURN elementId(start) AS key
+LIMIT 1
+"""
+
+
+def build_expansion_query(relationship_types: List[str], direction: str) -> str:
+    # Expands one BFS level: the distinct, not yet visited neighbours of the frontier
+    left = "<-" if direction == "in" else "-"
+    right = "->" if direction == "out" else "-"
+
+    return f"""
+    UNWIND $frontier AS key
+    MATCH (a) WHERE elementId(a) = key
+    MATCH (a){left}[:{"|".join(relationship_types)}]{right}(m)
+    WITH DISTINCT m
+    WHERE NOT elementId(m) IN $visited
+    RETURN elementId(m) AS key, labels(m) AS labels, properties(m) AS properties
+    LIMIT $remaining
+    """
+
+
+def traverse_graph(db: Neo4jConnection, start: str, relationship_types: List[str], direction: str, max_depth: int, limit: int, target_label: Optional[str]) -> List[dict]:
+    query = build_expansion_query(relationship_types, direction)
+    visited = [start]
+    frontier = [start]
+    nodes = []
+
+    # Each level is capped by the expansion budget, so work stays bounded however dense the graph is
+    for depth in range(1, max_depth + 1):
+        remaining = MAX_EXPANDED - len(visited)
+        if not frontier or remaining <= 0:
+            break
+
+        result = db.query(
+            CypherQuery(query, timeout=TRAVERSAL_TIMEOUT),
+            {"frontier": frontier, "visited": visited, "remaining": remaining}
+        )
+
+        frontier = [record["key"] for record in result]
+        visited += frontier
+
+        for record in result:
+            if target_label is None or target_label in record["labels"]:
+                nodes.append({"labels": record["labels"], "depth": depth, "properties": record["properties"]})
+                if len(nodes) == limit:
+                    return nodes
+
+    return nodes
+
+
+# Endpoint to find every node reachable from a start node within a bounded number of hops
+@router.get("/traverse/{node_id}", response_model=SearchResponse)
+def traverse(
+    node_id: str,
+    relationship_types: List[str] = Query(["CONTAINS", "column_of", "rule_of"]),
+    direction: Literal["out", "in", "both"] = "both",
+    max_depth: int = Query(2, ge=1, le=MAX_DEPTH),
+    limit: int = Query(100, ge=1, le=MAX_RESULTS),
+    target_label: Optional[str] = None,
+    db: Neo4jConnection = Depends(get_db)
+):
+    invalid_types = set(relationship_types) - RELATIONSHIP_TYPES
+    if invalid_types:
+        raise HTTPException(status_code=400, detail=f"Unsupported relationship types: {sorted(invalid_types)}")
+
+    if target_label is not None and target_label not in NODE_LABELS:
+        raise HTTPException(status_code=400, detail=f"Unsupported target label: {target_label}")
+
+    relationship_types = sorted(set(relationship_types))
+    cache_key = (node_id, tuple(relationship_types), direction, max_depth, limit, target_label)
+
+    nodes = subgraph_cache.get(cache_key)
+    if nodes is None:
+        generation = subgraph_cache.generation
+
+        try:
+            start = db.query(CypherQuery(START_QUERY, timeout=TRAVERSAL_TIMEOUT), {"node_id": node_id})
+            if not start:
+                raise HTTPException(status_code=404, detail="Node not found")
+
+            nodes = traverse_graph(db, start[0]["key"], relationship_types, direction, max_depth, limit, target_label)
+        except HTTPException:
+            raise
+        except ClientError as e:
+            # TRAVERSAL_TIMEOUT expired on the server
+            if "TransactionTimedOut" in (e.code or ""):
+                raise HTTPException(status_code=504, detail="Traversal timed out, reduce max_depth or limit")
+            raise HTTPException(status_code=500, detail=f"Error traversing graph: {e}")
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error traversing graph: {e}")
+
+        subgraph_cache.put(cache_key, nodes, generation)
+
+    if not nodes:
+        return SearchResponse(message="No connected nodes found", nodes=[])
+
+    return SearchResponse(message="Connected nodes found", nodes=nodes)
@@ -8,6 +8,12 @@ from src.config.database import Neo4jConnection, get_db
 from ..utils.idgenerator import generate_custom_id
 from uuid import UUID
 from ..models.metadata import SearchResponse
+from ..services.property_buffer import property_buffer
+from ..utils.etag import TOUCH_RELATED_TABLES
+from ..utils.catalog import match_catalog_node
+from ..validations.properties import invalid_property_keys
+from ..services.subgraph_cache import subgraph_cache
+from ..services.similarity_index import index_catalog_node
 
 router = APIRouter()
 load_dotenv()
@@ -143,8 +149,9 @@ def get_all_tables_with_full_column_metadata(database: str) -> Dict[str, Dict[st
     
 
 # Endpoint to get all tables with column metadata in all schemas in a specified database
+# Plain `def` so the blocking Snowflake calls run in the threadpool instead of the event loop
 @router.get("/extract-metadata/{database}", response_model=Dict[str, Dict[str, List[Dict[str, Any]]]])
-async def get_tables_with_columns(database: str):
+def get_tables_with_columns(database: str):
     return get_all_tables_with_full_column_metadata(database)
 
 
@@ -173,6 +180,7 @@ def save_to_neo4j(database: str, metadata: Dict[str, Dict[str, List[Dict[str, An
                     MATCH (s:Schema {name: $schema_name})
                     MERGE (t:Table {name: $table_name, custom_id: $table_custom_id})
                     MERGE (s)-[:CONTAINS]->(t)
+                    SET t.version = coalesce(t.version, 0) + 1, t.updated_at = timestamp()
                     """,
                     {"schema_name": schema_name, "table_name": table_name, "table_custom_id": table_custom_id}
                 )
@@ -188,6 +196,7 @@ def save_to_neo4j(database: str, metadata: Dict[str, Dict[str, List[Dict[str, An
                         MERGE (c:Column {name: $column_name, custom_id: $column_custom_id})
                         SET c += $column_properties
                         MERGE (t)-[:CONTAINS]->(c)
+                        SET t.version = coalesce(t.version, 0) + 1, t.updated_at = timestamp()
                         """,
                         {
                             "table_name": table_name,
@@ -198,14 +207,18 @@ def save_to_neo4j(database: str, metadata: Dict[str, Dict[str, List[Dict[str, An
                     )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error persisting metadata to Neo4j: {e}")
+    finally:
+        # Cached traversals may reference the graph as it was before this ingestion
+        subgraph_cache.invalidate()
 
 
 
 
 
 # Endpoint to retrieve metadata and save it to Neo4j
+# Plain `def` so the blocking Snowflake/Neo4j calls run in the threadpool instead of the event loop
 @router.post("/persist-metadata/{database}")
-async def persist_metadata(database: str, db: Neo4jConnection = Depends(get_db)):
+def persist_metadata(database: str, db: Neo4jConnection = Depends(get_db)):
     try:
         # Retrieve metadata from Snowflake
         metadata = get_all_tables_with_full_column_metadata(database)
@@ -219,23 +232,48 @@ async def persist_metadata(database: str, db: Neo4jConnection = Depends(get_db))
 
 
 
+# Plain `def` so the Neo4j calls and waiting on an in-flight buffer flush happen in the threadpool
 @router.put("/add_metadata/{node_id}")
-async def update_node_properties(
+def update_node_properties(
     node_id: UUID, 
     properties: Dict[str, Any], 
+    sync: bool = False,
     db: Neo4jConnection = Depends(get_db)
 ):
+    # Reject values Neo4j cannot store up front, a buffered update would otherwise fail only at flush time
+    invalid_keys = invalid_property_keys(properties)
+    if invalid_keys:
+        raise HTTPException(status_code=422, detail=f"Unsupported property values for: {invalid_keys}")
+
+    # Write-behind mode: acknowledge now, merge with other pending updates and write in the next batch.
+    # The node must exist at acknowledgement time; if it is deleted before the flush the update is logged and dropped.
+    if not sync and property_buffer.running:
+        exists = db.query(match_catalog_node("n", "$custom_id") + "RETURN n.custom_id LIMIT 1", {"custom_id": str(node_id)})
+        if not exists:
+            raise HTTPException(status_code=404, detail="Node not found")
+
+        pending = property_buffer.add(str(node_id), properties)
+        if pending is not None:
+            return {"message": "Node properties updated successfully", "node": {"custom_id": str(node_id), **pending}}
+
+    # Updates still buffered for this node are older, apply them underneath this one
+    properties = {**property_buffer.take(str(node_id)), **properties}
+
     try:
         # Prepare the Cypher query to update node properties based on custom_id
-        query = """
-        MATCH (n)
-        WHERE n.custom_id = $custom_id
+        query = match_catalog_node("n", "$custom_id") + """
         SET n += $properties
+        """ + TOUCH_RELATED_TABLES + """
         RETURN n
         """
         
         # Execute the query to update properties on the node
         result = db.query(query, {"custom_id": str(node_id), "properties": properties})
+        subgraph_cache.invalidate()
+
+        # Keep the similarity indexes in step with name/description changes
+        if result and ("contextual_description" in properties or "name" in properties):
+            index_catalog_node(list(result[0]["n"].labels), dict(result[0]["n"]))
         
         # Check if the node exists and was updated
         if not result:
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from ..models.rule import Rule
 # from ....config.database import Neo4jConnection, get_db
 from src.config.database import Neo4jConnection, get_db
+from ..utils.etag import check_not_modified
+from ..services.subgraph_cache import subgraph_cache
+from ..services.similarity_index import rule_index
 import uuid
 
 router = APIRouter()
@@ -20,22 +23,29 @@ def create_rule(rule: Rule, table_id: uuid.UUID, db: Neo4jConnection = Depends(g
     query = """
         MATCH (t: Table {custom_id: $table_id}) 
         CREATE (t) <-[r: rule_of]- (c: Rule {name: $name, custom_id: $rule_id, contextual_description: $contextual_description}) 
-        SET c += $dynamic_properties
+        SET c += $dynamic_properties, t.version = coalesce(t.version, 0) + 1, t.updated_at = timestamp()
         RETURN c.name, c.custom_id, c.contextual_description;
     """
 
     dynamic_properties = {k: v for k, v in rule.dynamic_properties.items() if isinstance(v, (str, int, float, bool, list))}
 
     result = db.query(query, {"table_id": str(table_id), "rule_id": rule_id, "name": rule.name, "contextual_description": rule.contextual_description, "dynamic_properties": dynamic_properties})
+    subgraph_cache.invalidate()
     
     if not result:
         raise HTTPException(status_code=400, detail="Failed to create rule")
+
+    rule_index.add(result[0]["c.custom_id"], result[0]["c.name"], result[0]["c.contextual_description"])
     
     return {"custom_id": result[0]["c.custom_id"],"name": result[0]["c.name"], "contextual_description": result[0]["c.contextual_description"], **dynamic_properties}
 
 
 @router.get("/rules/{table_id}")
-def get_rules(table_id: uuid.UUID, db: Neo4jConnection = Depends(get_db)):
+def get_rules(table_id: uuid.UUID, request: Request, response: Response, db: Neo4jConnection = Depends(get_db)):
+
+    not_modified = check_not_modified(request, response, db, "custom_id", str(table_id))
+    if not_modified:
+        return not_modified
 
     query = """MATCH (p:Rule)-[r:rule_of]-(t:Table {custom_id: $table_id})
     RETURN p,t
@@ -69,13 +79,15 @@ def get_rules(table_id: uuid.UUID,rule_id: uuid.UUID, db: Neo4jConnection = Depe
 @router.delete("/rules/{table_id}/{rule_id}")
 def delete_rule(table_id: uuid.UUID, rule_id: uuid.UUID, db: Neo4jConnection = Depends(get_db)):
 
-    db.query("""Match (t:Table {table_id: $table_id})-[r:rule_of]-(c:Rule {rule_id: $rule_id}) delete r""", {"table_id": str(table_id), "rule_id": str(rule_id)})
+    db.query("""Match (t:Table {table_id: $table_id})-[r:rule_of]-(c:Rule {rule_id: $rule_id}) SET t.version = coalesce(t.version, 0) + 1, t.updated_at = timestamp() delete r""", {"table_id": str(table_id), "rule_id": str(rule_id)})
 
     query = """MATCH (p:Rule {rule_id: $rule_id})
     Delete p
     """
 
     result = db.query(query, {"rule_id": str(rule_id)})
+    subgraph_cache.invalidate()
+    rule_index.remove(str(rule_id))
     
     if result:
         raise HTTPException(status_code=400, detail="Failed to delete rule")
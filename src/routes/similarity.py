@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Literal
+from src.config.database import Neo4jConnection, get_db
+from ..models.metadata import SearchResponse
+from ..services.similarity_index import column_index, rule_index
+
+router = APIRouter()
+
+MAX_RESULTS = 100
+
+indexes = {"columns": column_index, "rules": rule_index}
+
+
+# Endpoint to find columns or rules whose description is similar to a free text
+@router.get("/similar/{kind}", response_model=SearchResponse)
+def search_similar(
+    kind: Literal["columns", "rules"],
+    text: str,
+    k: int = Query(10, ge=1, le=MAX_RESULTS),
+    db: Neo4jConnection = Depends(get_db)
+):
+    if not text.strip():
+        raise HTTPException(status_code=400, detail="Search text must not be blank")
+
+    index = indexes[kind]
+    index.ensure_loaded(db)
+
+    nodes = index.search(text, k)
+
+    if not nodes:
+        return SearchResponse(message=f"No similar {kind} found", nodes=[])
+
+    return SearchResponse(message=f"Similar {kind} found", nodes=nodes)
+
+
+# Endpoint to find columns or rules similar to an existing one
+@router.get("/similar/{kind}/{item_id}", response_model=SearchResponse)
+def search_similar_to_item(
+    kind: Literal["columns", "rules"],
+    item_id: str,
+    k: int = Query(10, ge=1, le=MAX_RESULTS),
+    db: Neo4jConnection = Depends(get_db)
+):
+    index = indexes[kind]
+    index.ensure_loaded(db)
+
+    item = index.get(item_id)
+    if item is None:
+        raise HTTPException(status_code=404, detail=f"No indexed {kind} with id {item_id}")
+
+    nodes = index.search(f"{item['name']} {item['contextual_description']}", k, exclude=item_id)
+
+    if not nodes:
+        return SearchResponse(message=f"No similar {kind} found", nodes=[])
+
+    return SearchResponse(message=f"Similar {kind} found", nodes=nodes)
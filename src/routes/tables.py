@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from ..models.table import Table
 # from ....config.database import Neo4jConnection, get_db
 from src.config.database import Neo4jConnection, get_db
+from ..utils.etag import check_not_modified
+from ..services.subgraph_cache import subgraph_cache
 
 import uuid
 
@@ -12,12 +14,13 @@ def create_table(table: Table, db: Neo4jConnection = Depends(get_db)):
 
     table_id = str(uuid.uuid4())
 
-    query = """CREATE (p:Table {name: $name, table_id: $table_id})
+    query = """CREATE (p:Table {name: $name, table_id: $table_id, version: 1, updated_at: timestamp()})
     SET p += $dynamic_properties
     RETURN p.table_id, p.name"""
     dynamic_properties = {k: v for k, v in table.dynamic_properties.items() if isinstance(v, (str, int, float, bool, list))}
 
     result = db.query(query, {"table_id": table_id, "name": table.name, "dynamic_properties": dynamic_properties})
+    subgraph_cache.invalidate()
     
     if not result:
         raise HTTPException(status_code=400, detail="Failed to create table")
@@ -27,7 +30,11 @@ def create_table(table: Table, db: Neo4jConnection = Depends(get_db)):
     
 
 @router.get("/tables/{table_id}")
-def get_table(table_id: uuid.UUID, db: Neo4jConnection = Depends(get_db)):
+def get_table(table_id: uuid.UUID, request: Request, response: Response, db: Neo4jConnection = Depends(get_db)):
+
+    not_modified = check_not_modified(request, response, db, "table_id", str(table_id))
+    if not_modified:
+        return not_modified
 
     query = """MATCH (p:Table {table_id: $table_id})
     RETURN p
@@ -51,6 +58,7 @@ def delete_table(table_id: uuid.UUID, db: Neo4jConnection = Depends(get_db)):
     
 
     result = db.query(query, {"table_id": str(table_id)})
+    subgraph_cache.invalidate()
     
     if result:
         raise HTTPException(status_code=400, detail="Failed to delete table")
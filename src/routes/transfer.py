@@ -0,0 +1,52 @@
+import os
+import re
+from fastapi import APIRouter, Depends, HTTPException
+from src.config.database import Neo4jConnection, get_db
+from ..services.graph_transfer import GRAPH_EXPORT_DIR, CatalogNotEmptyError, ImportInProgressError, export_graph, import_graph, invalidate_caches
+
+router = APIRouter()
+
+
+# Exports live in named sub-directories of GRAPH_EXPORT_DIR, never in arbitrary paths
+EXPORT_NAME = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+def export_directory(name: str) -> str:
+    if not EXPORT_NAME.match(name):
+        raise HTTPException(status_code=400, detail="Export name may only contain letters, digits, '-' and '_'")
+    return os.path.join(GRAPH_EXPORT_DIR, name)
+
+
+# Endpoint to dump all catalog nodes and relationships to compressed chunk files
+@router.post("/graph/export/{name}")
+def export_catalog(name: str, db: Neo4jConnection = Depends(get_db)):
+    directory = export_directory(name)
+    try:
+        manifest = export_graph(db, directory)
+        return {"message": "Graph exported successfully", "directory": directory, "manifest": manifest}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error exporting graph: {e}")
+
+
+# Endpoint to load a previous export into this environment
+@router.post("/graph/import/{name}")
+def import_catalog(name: str, wipe: bool = False, db: Neo4jConnection = Depends(get_db)):
+    directory = export_directory(name)
+    if not os.path.isfile(os.path.join(directory, "manifest.json")):
+        raise HTTPException(status_code=404, detail=f"Export '{name}' not found")
+    try:
+        counts = import_graph(db, directory, wipe=wipe)
+        if counts["nodes"] < counts["expected_nodes"] or counts["relationships"] < counts["expected_relationships"]:
+            return {"message": "Graph imported partially, some nodes or relationships were not written", **counts}
+        return {"message": "Graph imported successfully", **counts}
+    except (CatalogNotEmptyError, ImportInProgressError) as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error importing graph: {e}")
+
+
+# Endpoint for out-of-process imports (the CLI) to drop this process's traversal and similarity caches
+@router.post("/graph/invalidate-caches")
+def invalidate_catalog_caches():
+    invalidate_caches()
+    return {"message": "Caches invalidated"}
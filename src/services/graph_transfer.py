@@ -0,0 +1,294 @@
+import argparse
+import gzip
+import json
+import os
+import shutil
+import threading
+import urllib.error
+import urllib.request
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from os import getenv
+from typing import Any, Dict, Iterable, List
+from dotenv import load_dotenv
+from src.config.database import Neo4jConnection
+from src.services.subgraph_cache import subgraph_cache
+from src.services.similarity_index import column_index, rule_index
+from src.utils.catalog import CATALOG_LABELS
+
+load_dotenv()
+
+
+# Graph export/import configuration
+GRAPH_EXPORT_DIR = getenv("GRAPH_EXPORT_DIR", "exports")
+EXPORT_CHUNK_SIZE = int(getenv("EXPORT_CHUNK_SIZE", "50000"))
+IMPORT_BATCH_SIZE = int(getenv("IMPORT_BATCH_SIZE", "5000"))
+IMPORT_WORKERS = int(getenv("IMPORT_WORKERS", "4"))
+
+FORMAT_VERSION = 1
+LABELS = CATALOG_LABELS
+
+# Prefix of the temporary property holding the source element id, used to wire up relationships on import
+IMPORT_KEY = "_import_key"
+
+import_lock = threading.Lock()
+
+
+class CatalogNotEmptyError(Exception):
+    pass
+
+
+class ImportInProgressError(Exception):
+    pass
+
+
+def write_chunks(directory: str, prefix: str, rows: Iterable[Dict[str, Any]], chunk_size: int) -> List[Dict[str, Any]]:
+    # Writes rows as gzipped JSON lines, starting a new file every `chunk_size` rows
+    files = []
+    handle = None
+
+    for row in rows:
+        if handle is None or files[-1]["count"] == chunk_size:
+            if handle is not None:
+                handle.close()
+            name = f"{prefix}-{len(files):05d}.jsonl.gz"
+            handle = gzip.open(os.path.join(directory, name), "wt", encoding="utf-8")
+            files.append({"file": name, "count": 0})
+
+        handle.write(json.dumps(row, default=str) + "\n")
+        files[-1]["count"] += 1
+
+    if handle is not None:
+        handle.close()
+
+    return files
+
+
+def read_chunk(directory: str, name: str) -> List[Dict[str, Any]]:
+    with gzip.open(os.path.join(directory, name), "rt", encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle]
+
+
+def batches(rows: List[Dict[str, Any]], size: int) -> Iterable[List[Dict[str, Any]]]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def export_graph(db: Neo4jConnection, directory: str, chunk_size: int = EXPORT_CHUNK_SIZE) -> Dict[str, Any]:
+    # Write into a scratch directory and swap it into place at the end, so a failed
+    # re-export never leaves a manifest pointing at half-rewritten chunks
+    directory = os.path.normpath(directory)
+    os.makedirs(os.path.dirname(directory) or ".", exist_ok=True)
+    scratch = f"{directory}.tmp-{uuid.uuid4().hex[:8]}"
+    os.makedirs(scratch)
+
+    try:
+        manifest = {"format_version": FORMAT_VERSION, "nodes": {}, "relationships": []}
+
+        # Step 1: Stream every node of each catalog label into its own set of chunks
+        for label in LABELS:
+            records = db.stream(f"MATCH (n:{label}) RETURN elementId(n) AS key, properties(n) AS properties")
+            rows = ({"key": record["key"], "properties": record["properties"]} for record in records)
+            manifest["nodes"][label] = write_chunks(scratch, f"nodes-{label}", rows, chunk_size)
+
+        # Step 2: Stream every relationship between catalog nodes
+        records = db.stream(
+            """
+            MATCH (a)-[r]->(b)
+            WHERE any(l IN labels(a) WHERE l IN $labels) AND any(l IN labels(b) WHERE l IN $labels)
+            RETURN elementId(a) AS start, [l IN labels(a) WHERE l IN $labels][0] AS start_label,
+                   type(r) AS type, properties(r) AS properties,
+                   elementId(b) AS end, [l IN labels(b) WHERE l IN $labels][0] AS end_label
+            """,
+            {"labels": LABELS}
+        )
+        rows = (
+            {
+                "start": record["start"], "start_label": record["start_label"],
+                "type": record["type"], "properties": record["properties"],
+                "end": record["end"], "end_label": record["end_label"],
+            }
+            for record in records
+        )
+        manifest["relationships"] = write_chunks(scratch, "relationships", rows, chunk_size)
+
+        with open(os.path.join(scratch, "manifest.json"), "w", encoding="utf-8") as handle:
+            json.dump(manifest, handle, indent=2)
+    except Exception:
+        shutil.rmtree(scratch, ignore_errors=True)
+        raise
+
+    # Step 3: Swap the finished export into place, moving any previous one aside first
+    previous = None
+    if os.path.exists(directory):
+        previous = f"{directory}.old-{uuid.uuid4().hex[:8]}"
+        os.replace(directory, previous)
+    os.replace(scratch, directory)
+    if previous:
+        shutil.rmtree(previous, ignore_errors=True)
+
+    return manifest
+
+
+def import_node_chunk(db: Neo4jConnection, directory: str, label: str, name: str, batch_size: int, import_key: str) -> int:
+    query = f"""
+    UNWIND $rows AS row
+    CREATE (n:{label})
+    SET n = row.properties, n.{import_key} = row.key
+    """
+    if label == "Table":
+        # Imported tables are new content here, so ETags handed out for the old data must stop matching
+        query += "SET n.version = coalesce(n.version, 0) + 1, n.updated_at = timestamp()\n"
+    query += "RETURN count(n) AS created\n"
+
+    created = 0
+    for batch in batches(read_chunk(directory, name), batch_size):
+        result = db.execute_write(query, {"rows": batch})
+        created += result[0]["created"] if result else 0
+    return created
+
+
+def import_relationship_chunk(db: Neo4jConnection, directory: str, name: str, batch_size: int, import_key: str) -> int:
+    rows = read_chunk(directory, name)
+
+    # One query shape per (type, start label, end label) so both ends are looked up through the label index
+    groups = defaultdict(list)
+    for row in rows:
+        if row["start_label"] in LABELS and row["end_label"] in LABELS:
+            groups[(row["type"], row["start_label"], row["end_label"])].append(row)
+
+    created = 0
+    for (rel_type, start_label, end_label), group in groups.items():
+        query = f"""
+        UNWIND $rows AS row
+        MATCH (a:{start_label} {{{import_key}: row.start}})
+        MATCH (b:{end_label} {{{import_key}: row.end}})
+        CREATE (a)-[r:`{rel_type.replace("`", "``")}`]->(b)
+        SET r = row.properties
+        RETURN count(r) AS created
+        """
+        for batch in batches(group, batch_size):
+            result = db.execute_write(query, {"rows": batch})
+            created += result[0]["created"] if result else 0
+
+    return created
+
+
+def catalog_is_empty(db: Neo4jConnection) -> bool:
+    return not any(db.query(f"MATCH (n:{label}) RETURN 1 LIMIT 1") for label in LABELS)
+
+
+def import_graph(db: Neo4jConnection, directory: str, wipe: bool = False, batch_size: int = IMPORT_BATCH_SIZE, workers: int = IMPORT_WORKERS) -> Dict[str, int]:
+    with open(os.path.join(directory, "manifest.json"), encoding="utf-8") as handle:
+        manifest = json.load(handle)
+
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported export format version: {manifest.get('format_version')}")
+
+    # Imports wipe/check the whole catalog, so only one may run in this process at a time
+    if not import_lock.acquire(blocking=False):
+        raise ImportInProgressError("Another graph import is already running")
+
+    try:
+        # Step 1: Clear the existing catalog, or refuse to import on top of it (nodes would be duplicated)
+        if wipe:
+            db.query(
+                """
+                MATCH (n) WHERE any(l IN labels(n) WHERE l IN $labels)
+                CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 10000 ROWS
+                """,
+                {"labels": LABELS}
+            )
+        elif not catalog_is_empty(db):
+            raise CatalogNotEmptyError("The catalog already holds nodes, import with wipe to replace them")
+
+        # Step 2: Index a temporary key, scoped to this run so concurrent imports elsewhere keep their own
+        run_id = uuid.uuid4().hex[:8]
+        import_key = f"{IMPORT_KEY}_{run_id}"
+        for label in LABELS:
+            db.query(f"CREATE INDEX import_key_{label}_{run_id} IF NOT EXISTS FOR (n:{label}) ON (n.{import_key})")
+        db.query("CALL db.awaitIndexes(300)")
+
+        counts = {"nodes": 0, "relationships": 0}
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                # Step 3: Load node chunks in parallel, all of them must land before relationships
+                node_jobs = [
+                    pool.submit(import_node_chunk, db, directory, label, chunk["file"], batch_size, import_key)
+                    for label, chunks in manifest["nodes"].items() if label in LABELS
+                    for chunk in chunks
+                ]
+                counts["nodes"] = sum(job.result() for job in node_jobs)
+
+                # Step 4: Load relationship chunks in parallel, deadlocks are retried by execute_write
+                relationship_jobs = [
+                    pool.submit(import_relationship_chunk, db, directory, chunk["file"], batch_size, import_key)
+                    for chunk in manifest["relationships"]
+                ]
+                counts["relationships"] = sum(job.result() for job in relationship_jobs)
+        finally:
+            # Step 5: Drop this run's temporary key and indexes
+            for label in LABELS:
+                db.query(
+                    f"""
+                    MATCH (n:{label}) WHERE n.{import_key} IS NOT NULL
+                    CALL {{ WITH n REMOVE n.{import_key} }} IN TRANSACTIONS OF 10000 ROWS
+                    """
+                )
+                db.query(f"DROP INDEX import_key_{label}_{run_id} IF EXISTS")
+
+            invalidate_caches()
+    finally:
+        import_lock.release()
+
+    # Counts are what was actually written, compare with the manifest to spot partial imports
+    counts["expected_nodes"] = sum(chunk["count"] for label, chunks in manifest["nodes"].items() if label in LABELS for chunk in chunks)
+    counts["expected_relationships"] = sum(chunk["count"] for chunk in manifest["relationships"])
+    return counts
+
+
+def invalidate_caches():
+    # Traversal and similarity caches live in the API process, see `--api-url` for CLI imports
+    subgraph_cache.invalidate()
+    column_index.reset()
+    rule_index.reset()
+
+
+def notify_api(api_url: str):
+    # Asks a running API to drop caches that still describe the graph as it was before the import
+    request = urllib.request.Request(f"{api_url.rstrip('/')}/graph/invalidate-caches", method="POST")
+    with urllib.request.urlopen(request, timeout=30) as response:
+        response.read()
+
+
+# Command line entry point, e.g. `python -m src.services.graph_transfer import exports/staging --api-url http://localhost:8000`
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export or import the catalog graph")
+    parser.add_argument("action", choices=["export", "import"])
+    parser.add_argument("directory")
+    parser.add_argument("--wipe", action="store_true", help="Delete existing catalog nodes before importing")
+    parser.add_argument("--api-url", help="Base URL of the running API, whose caches are invalidated after an import")
+    args = parser.parse_args()
+
+    connection = Neo4jConnection(getenv("NEO4J_URI"), getenv("NEO4J_USER"), getenv("NEO4J_PASSWORD"))
+    try:
+        if args.action == "export":
+            result = export_graph(connection, args.directory)
+        else:
+            try:
+                result = import_graph(connection, args.directory, wipe=args.wipe)
+            except (CatalogNotEmptyError, ImportInProgressError) as e:
+                parser.exit(1, f"{e}\n")
+            notified = False
+            if args.api_url:
+                try:
+                    notify_api(args.api_url)
+                    notified = True
+                except (urllib.error.URLError, OSError) as e:
+                    print(f"Could not invalidate API caches: {e}")
+            if not notified:
+                print("Note: restart the API or POST /graph/invalidate-caches, it may still serve cached pre-import results")
+        print(json.dumps(result, indent=2))
+    finally:
+        connection.close()
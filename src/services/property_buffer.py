@@ -0,0 +1,157 @@
+import logging
+import threading
+from os import getenv
+from typing import Dict, Any, Optional
+from dotenv import load_dotenv
+from neo4j.exceptions import ServiceUnavailable, SessionExpired, TransientError
+from src.config.database import Neo4jConnection, NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD
+from src.utils.etag import TOUCH_RELATED_TABLES
+from src.utils.catalog import match_catalog_node
+from src.services.subgraph_cache import subgraph_cache
+from src.services.similarity_index import index_catalog_node
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+# Write-behind configuration for PUT /add_metadata/{node_id}
+WRITE_BEHIND_ENABLED = getenv("WRITE_BEHIND_ENABLED", "false").lower() == "true"
+WRITE_BEHIND_FLUSH_MS = int(getenv("WRITE_BEHIND_FLUSH_MS", "200"))
+WRITE_BEHIND_MAX_ITEMS = int(getenv("WRITE_BEHIND_MAX_ITEMS", "500"))
+# Above this many distinct pending nodes, new nodes fall back to a synchronous write
+WRITE_BEHIND_MAX_PENDING = int(getenv("WRITE_BEHIND_MAX_PENDING", "10000"))
+
+
+FLUSH_QUERY = """
+UNWIND $rows AS row
+""" + match_catalog_node("n", "row.custom_id", "row") + """
+SET n += row.properties
+""" + TOUCH_RELATED_TABLES + """
+RETURN labels(n) AS labels, n {.custom_id, .column_id, .rule_id, .name, .contextual_description} AS properties
+"""
+
+# Errors worth retrying the same batch for, anything else means Neo4j rejected the data
+RETRYABLE_ERRORS = (TransientError, ServiceUnavailable, SessionExpired)
+
+
+class PropertyWriteBuffer:
+    def __init__(self, flush_interval_ms: int, max_items: int, max_pending: int):
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_items = max_items
+        self.max_pending = max_pending
+
+        # custom_id -> merged properties waiting to be written
+        self.pending: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.flush_event = threading.Event()
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self.db: Optional[Neo4jConnection] = None
+
+    @property
+    def running(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self.db = Neo4jConnection(NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD)
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name="property-write-buffer", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        # Flush whatever is still pending before closing the connection
+        if not self.running:
+            return
+        self.stop_event.set()
+        self.flush_event.set()
+        self.thread.join()
+        self.thread = None
+        self.flush()
+        self.db.close()
+        self.db = None
+
+        # The connection is gone, whatever the final flush could not write is lost
+        with self.lock:
+            if self.pending:
+                logger.error("Dropping %d pending write-behind update(s) on shutdown", len(self.pending))
+                self.pending = {}
+
+    def add(self, custom_id: str, properties: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        # Returns the merged pending properties, or None when the caller must write synchronously
+        with self.lock:
+            if not self.running:
+                return None
+            if custom_id not in self.pending and len(self.pending) >= self.max_pending:
+                return None
+
+            merged = self.pending.setdefault(custom_id, {})
+            merged.update(properties)
+
+            if len(self.pending) >= self.max_items:
+                self.flush_event.set()
+
+            return dict(merged)
+
+    def take(self, custom_id: str) -> Dict[str, Any]:
+        # Removes and returns the pending properties of one node, so a synchronous write can apply them first.
+        # Holding flush_lock waits out an in-flight flush that might otherwise land after the caller's write.
+        with self.flush_lock:
+            with self.lock:
+                return self.pending.pop(custom_id, {})
+
+    def flush(self):
+        with self.flush_lock:
+            with self.lock:
+                batch, self.pending = self.pending, {}
+
+            if not batch:
+                return
+
+            rows = [{"custom_id": custom_id, "properties": properties} for custom_id, properties in batch.items()]
+            try:
+                self._write(rows)
+            except RETRYABLE_ERRORS as e:
+                logger.error("Write-behind flush of %d node(s) failed, requeueing: %s", len(rows), e)
+                self._requeue(rows)
+            except Exception as e:
+                # One bad row fails the whole batch, write rows one by one and drop the ones Neo4j rejects
+                logger.warning("Write-behind batch of %d node(s) rejected, retrying row by row: %s", len(rows), e)
+                for position, row in enumerate(rows):
+                    try:
+                        self._write([row])
+                    except RETRYABLE_ERRORS as e:
+                        logger.error("Write-behind flush of %d node(s) failed, requeueing: %s", len(rows) - position, e)
+                        self._requeue(rows[position:])
+                        break
+                    except Exception as e:
+                        logger.error("Dropping write-behind update for node %s: %s", row["custom_id"], e)
+
+    def _write(self, rows):
+        result = self.db.execute_write(FLUSH_QUERY, {"rows": rows})
+        subgraph_cache.invalidate()
+        if any("contextual_description" in row["properties"] or "name" in row["properties"] for row in rows):
+            for record in result:
+                index_catalog_node(record["labels"], record["properties"])
+        if len(result) < len(rows):
+            logger.warning("Write-behind flush skipped %d unknown node(s)", len(rows) - len(result))
+
+    def _requeue(self, rows):
+        # Put the rows back underneath any updates that arrived in the meantime
+        with self.lock:
+            for row in rows:
+                self.pending[row["custom_id"]] = {**row["properties"], **self.pending.get(row["custom_id"], {})}
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            self.flush_event.wait(self.flush_interval)
+            self.flush_event.clear()
+            if self.stop_event.is_set():
+                break
+            self.flush()
+
+
+property_buffer = PropertyWriteBuffer(WRITE_BEHIND_FLUSH_MS, WRITE_BEHIND_MAX_ITEMS, WRITE_BEHIND_MAX_PENDING)
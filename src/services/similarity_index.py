@@ -0,0 +1,199 @@
+import threading
+import zlib
+from os import getenv
+from typing import Any, Dict, List, Optional
+import numpy as np
+from dotenv import load_dotenv
+from src.config.database import Neo4jConnection
+
+load_dotenv()
+
+
+# Size of the hashed feature space, each indexed item costs 4 bytes per dimension
+SIMILARITY_DIMENSIONS = int(getenv("SIMILARITY_DIMENSIONS", "1024"))
+NGRAM_SIZE = 3
+
+
+def vectorize(text: str, dimensions: int) -> np.ndarray:
+    # Hashed character trigrams plus whole words, log-scaled term counts, L2 normalised
+    normalized = " ".join(text.lower().split())
+    padded = f" {normalized} "
+    features = [padded[i:i + NGRAM_SIZE] for i in range(len(padded) - NGRAM_SIZE + 1)]
+    features += normalized.split()
+
+    vector = np.zeros(dimensions, dtype=np.float32)
+    if not features:
+        return vector
+
+    buckets = np.fromiter((zlib.crc32(feature.encode()) % dimensions for feature in features), dtype=np.int64, count=len(features))
+    vector += np.log1p(np.bincount(buckets, minlength=dimensions)).astype(np.float32)
+
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class SimilarityIndex:
+    def __init__(self, load_query: str, dimensions: int):
+        # `load_query` must return `id`, `name` and `description` for every item to index
+        self.load_query = load_query
+        self.dimensions = dimensions
+        self.lock = threading.Lock()
+        self.loaded = False
+        # Bumped on every mutation so a load can tell its snapshot was overtaken by writes
+        self.generation = 0
+
+        # Row i of `matrix` holds the vector of ids[i]; rows past `size` are spare capacity
+        self.matrix = np.zeros((0, dimensions), dtype=np.float32)
+        self.size = 0
+        self.ids: List[str] = []
+        self.items: List[Dict[str, Any]] = []
+        self.rows: Dict[str, int] = {}
+
+    def ensure_loaded(self, db: Neo4jConnection, attempts: int = 3):
+        # Builds the index from the graph on first use, or after a reset
+        for _ in range(attempts):
+            with self.lock:
+                if self.loaded:
+                    return
+                generation = self.generation
+
+            result = db.query(self.load_query)
+
+            with self.lock:
+                if self.loaded:
+                    return
+                # Adds/removes during the query are not in the snapshot, so it is stale; try again
+                if generation == self.generation:
+                    self._load(result)
+                    return
+
+        # Writes keep racing the snapshot, load while holding the lock so none can slip in
+        with self.lock:
+            if not self.loaded:
+                self._load(db.query(self.load_query))
+
+    def reset(self):
+        # Drops everything, the next query rebuilds from the graph
+        with self.lock:
+            self.matrix = np.zeros((0, self.dimensions), dtype=np.float32)
+            self.size = 0
+            self.ids, self.items, self.rows = [], [], {}
+            self.loaded = False
+            self.generation += 1
+
+    def add(self, item_id: str, name: str, description: str):
+        with self.lock:
+            self.generation += 1
+            # Nothing to do until the index is built, the initial load will pick the item up
+            if self.loaded:
+                self._upsert(item_id, name, description)
+
+    def remove(self, item_id: str):
+        with self.lock:
+            self.generation += 1
+            row = self.rows.pop(item_id, None)
+            if row is None:
+                return
+
+            # Move the last row into the freed slot to keep the matrix dense
+            last = self.size - 1
+            if row != last:
+                self.matrix[row] = self.matrix[last]
+                self.ids[row] = self.ids[last]
+                self.items[row] = self.items[last]
+                self.rows[self.ids[row]] = row
+            self.ids.pop()
+            self.items.pop()
+            self.size -= 1
+
+    def search(self, text: str, k: int, exclude: Optional[str] = None) -> List[Dict[str, Any]]:
+        query = vectorize(text, self.dimensions)
+
+        # Blank text has no features, every score would be 0
+        if not query.any():
+            return []
+
+        with self.lock:
+            if self.size == 0:
+                return []
+
+            scores = self.matrix[:self.size] @ query
+            candidates = k
+            if exclude in self.rows:
+                scores[self.rows[exclude]] = -np.inf
+                candidates += 1
+
+            candidates = min(candidates, self.size)
+            top = np.argpartition(-scores, candidates - 1)[:candidates]
+            top = top[np.argsort(-scores[top])]
+
+            return [
+                {**self.items[row], "score": float(scores[row])}
+                for row in top
+                if np.isfinite(scores[row])
+            ][:k]
+
+    def get(self, item_id: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            row = self.rows.get(item_id)
+            return None if row is None else self.items[row]
+
+    def _load(self, records):
+        for record in records:
+            self._upsert(record["id"], record["name"], record["description"])
+        self.loaded = True
+
+    def _upsert(self, item_id: str, name: str, description: str):
+        vector = vectorize(f"{name} {description}", self.dimensions)
+        item = {"id": item_id, "name": name, "contextual_description": description}
+
+        row = self.rows.get(item_id)
+        if row is None:
+            # Grow the matrix geometrically so appends stay amortised O(1)
+            if self.size == self.matrix.shape[0]:
+                grown = np.zeros((max(64, self.size * 2), self.dimensions), dtype=np.float32)
+                grown[:self.size] = self.matrix[:self.size]
+                self.matrix = grown
+            row = self.size
+            self.size += 1
+            self.rows[item_id] = row
+            self.ids.append(item_id)
+            self.items.append(item)
+        else:
+            self.items[row] = item
+
+        self.matrix[row] = vector
+
+
+column_index = SimilarityIndex(
+    """MATCH (c:Column)
+    WHERE c.contextual_description IS NOT NULL
+    RETURN coalesce(c.column_id, c.custom_id) AS id, c.name AS name, c.contextual_description AS description
+    """,
+    SIMILARITY_DIMENSIONS,
+)
+
+rule_index = SimilarityIndex(
+    """MATCH (r:Rule)
+    WHERE r.contextual_description IS NOT NULL
+    RETURN coalesce(r.custom_id, r.rule_id) AS id, r.name AS name, r.contextual_description AS description
+    """,
+    SIMILARITY_DIMENSIONS,
+)
+
+
+def index_catalog_node(labels: List[str], properties: Dict[str, Any]):
+    # Re-indexes a Column/Rule node whose name or description changed outside the CRUD routes
+    description = properties.get("contextual_description")
+    targets = []
+    if "Column" in labels:
+        targets.append((column_index, properties.get("column_id") or properties.get("custom_id")))
+    if "Rule" in labels:
+        targets.append((rule_index, properties.get("custom_id") or properties.get("rule_id")))
+
+    for index, item_id in targets:
+        # A cleared description takes the item out of the index, like the load query would
+        if description is None:
+            index.remove(item_id)
+        else:
+            index.add(item_id, properties.get("name"), description)
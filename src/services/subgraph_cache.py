@@ -0,0 +1,51 @@
+import threading
+from collections import OrderedDict
+from os import getenv
+from typing import Any, Hashable, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+# Maximum number of cached traversal results
+SUBGRAPH_CACHE_SIZE = int(getenv("SUBGRAPH_CACHE_SIZE", "256"))
+
+
+class SubgraphCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.lock = threading.Lock()
+        # Bumped on every invalidation so results computed before a write are never stored
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self.lock:
+            if key not in self.entries:
+                self.misses += 1
+                return None
+            # Mark as most recently used
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+
+    def put(self, key: Hashable, value: Any, generation: int):
+        with self.lock:
+            if generation != self.generation:
+                return
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            # Evict least recently used entries
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def invalidate(self):
+        # Called by every write path that changes the graph
+        with self.lock:
+            self.entries.clear()
+            self.generation += 1
+
+
+subgraph_cache = SubgraphCache(SUBGRAPH_CACHE_SIZE)
@@ -0,0 +1,34 @@
+from typing import Iterable
+from src.config.database import Neo4jConnection
+
+
+# Catalog labels and the id properties each label can be looked up by
+CATALOG_ID_PROPERTIES = {
+    "Database": ["custom_id"],
+    "Schema": ["custom_id"],
+    "Table": ["custom_id", "table_id"],
+    "Column": ["custom_id", "column_id"],
+    "Rule": ["custom_id", "rule_id"],
+}
+CATALOG_LABELS = list(CATALOG_ID_PROPERTIES)
+
+
+def create_catalog_indexes(db: Neo4jConnection):
+    # One index per (label, id property) so node lookups never scan the whole graph
+    for label, keys in CATALOG_ID_PROPERTIES.items():
+        for key in keys:
+            db.query(f"CREATE INDEX catalog_{label}_{key} IF NOT EXISTS FOR (n:{label}) ON (n.{key})")
+
+
+def match_catalog_node(variable: str, value: str, imported: str = "", id_properties: Iterable[str] = ("custom_id",)) -> str:
+    # Cypher subquery binding `variable` to the catalog node whose id equals `value`,
+    # as a UNION of per-label matches so each branch is an index seek.
+    # `imported` names an outer variable the branches need, e.g. the row of an UNWIND.
+    importing = f"WITH {imported} " if imported else ""
+    branches = [
+        f"{importing}MATCH ({variable}:{label} {{{key}: {value}}}) RETURN {variable}"
+        for label, keys in CATALOG_ID_PROPERTIES.items()
+        for key in keys
+        if key in id_properties
+    ]
+    return "CALL {\n    " + "\n    UNION\n    ".join(branches) + "\n}\n"
@@ -0,0 +1,49 @@
+from email.utils import formatdate
+from typing import Optional
+from fastapi import Request, Response
+from src.config.database import Neo4jConnection
+
+
+# Cypher fragment bumping the version of every Table affected by a change to node `n`:
+# the node itself, the table a Column/Rule belongs to, or the table CONTAINing it
+TOUCH_RELATED_TABLES = """
+WITH n, [n] + [(n)-[:column_of|rule_of]->(t:Table) | t] + [(t:Table)-[:CONTAINS]->(n) | t] AS related
+FOREACH (t IN [x IN related WHERE x:Table] | SET t.version = coalesce(t.version, 0) + 1, t.updated_at = timestamp())
+"""
+
+
+def get_table_version(db: Neo4jConnection, id_key: str, table_id: str) -> Optional[dict]:
+    # Cheap version-only lookup, `id_key` is the property the calling route identifies tables by
+    query = f"""MATCH (t:Table {{{id_key}: $table_id}})
+    RETURN t.version AS version, t.updated_at AS updated_at
+    LIMIT 1
+    """
+
+    result = db.query(query, {"table_id": table_id})
+
+    if not result:
+        return None
+
+    return {"version": result[0]["version"] or 0, "updated_at": result[0]["updated_at"]}
+
+
+def check_not_modified(request: Request, response: Response, db: Neo4jConnection, id_key: str, table_id: str) -> Optional[Response]:
+    # Returns a 304 response when the client's ETag is current, otherwise sets the validators on `response`
+    version = get_table_version(db, id_key, table_id)
+
+    if version is None:
+        return None
+
+    # updated_at is part of the tag so a counter that restarts (e.g. after an import) cannot repeat an old ETag
+    headers = {"ETag": f'"{table_id}-{version["version"]}-{version["updated_at"] or 0}"'}
+    if version["updated_at"] is not None:
+        headers["Last-Modified"] = formatdate(version["updated_at"] / 1000, usegmt=True)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if "*" in tags or headers["ETag"] in tags:
+            return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
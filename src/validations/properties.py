@@ -0,0 +1,18 @@
+from typing import Any, Dict, List
+
+# Property value types Neo4j can store (None removes the property on SET +=)
+PRIMITIVE_TYPES = (str, int, float, bool)
+
+
+def is_storable(value: Any) -> bool:
+    if value is None or isinstance(value, PRIMITIVE_TYPES):
+        return True
+    # Lists must hold primitives of a single type
+    if isinstance(value, list):
+        return all(isinstance(item, PRIMITIVE_TYPES) for item in value) and len({type(item) for item in value}) <= 1
+    return False
+
+
+def invalid_property_keys(properties: Dict[str, Any]) -> List[str]:
+    # Keys whose values Neo4j would reject, e.g. nested maps or mixed-type lists
+    return [key for key, value in properties.items() if not is_storable(value)]
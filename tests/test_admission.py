@@ -0,0 +1,55 @@
+import asyncio
+from src.middlewares.admission import RouteClassLimiter
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_sheds_when_queue_is_full():
+    async def scenario():
+        limiter = RouteClassLimiter("bulk", max_concurrency=1, max_queue=0, queue_timeout=1, retry_after=1)
+        assert await limiter.acquire()
+        assert not await limiter.acquire()
+        return limiter.metrics()
+
+    metrics = run(scenario())
+    assert metrics["rejected_queue_full"] == 1
+    assert metrics["in_flight"] == 1
+
+
+def test_sheds_after_queue_timeout():
+    async def scenario():
+        limiter = RouteClassLimiter("bulk", max_concurrency=1, max_queue=1, queue_timeout=0.01, retry_after=1)
+        await limiter.acquire()
+        assert not await limiter.acquire()
+        return limiter.metrics()
+
+    metrics = run(scenario())
+    assert metrics["rejected_timeout"] == 1
+    assert metrics["queued"] == 0
+
+
+def test_freed_slot_goes_to_oldest_waiter():
+    async def scenario():
+        limiter = RouteClassLimiter("bulk", max_concurrency=1, max_queue=2, queue_timeout=1, retry_after=1)
+        order = []
+
+        async def request(name):
+            if await limiter.acquire():
+                order.append(name)
+                await asyncio.sleep(0.01)
+                limiter.release()
+
+        await limiter.acquire()
+        first = asyncio.create_task(request("queued"))
+        await asyncio.sleep(0)
+        limiter.release()
+        # Arrives after the release but must not overtake the queued request
+        second = asyncio.create_task(request("new"))
+        await asyncio.gather(first, second)
+        return order, limiter.metrics()
+
+    order, metrics = run(scenario())
+    assert order == ["queued", "new"]
+    assert metrics["in_flight"] == 0
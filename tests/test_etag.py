@@ -0,0 +1,49 @@
+import pytest
+from fastapi import Request, Response
+from src.utils.etag import check_not_modified
+
+ETAG = '"t1-3-1700000000000"'
+
+
+class FakeDB:
+    def query(self, query, parameters={}):
+        return [{"version": 3, "updated_at": 1700000000000}]
+
+
+def make_request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_sets_validators_without_condition():
+    response = Response()
+
+    assert check_not_modified(make_request(), response, FakeDB(), "table_id", "t1") is None
+    assert response.headers["etag"] == ETAG
+    assert response.headers["last-modified"] == "Tue, 14 Nov 2023 22:13:20 GMT"
+
+
+@pytest.mark.parametrize("if_none_match", [ETAG, "*", f"W/{ETAG}", f'"other", {ETAG}'])
+def test_matching_condition_returns_304(if_none_match):
+    not_modified = check_not_modified(make_request(if_none_match), Response(), FakeDB(), "table_id", "t1")
+
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == ETAG
+
+
+def test_stale_etag_gets_full_response():
+    response = Response()
+
+    assert check_not_modified(make_request('"t1-2-1600000000000"'), response, FakeDB(), "table_id", "t1") is None
+    assert response.headers["etag"] == ETAG
+
+
+def test_unknown_table_is_left_to_the_route():
+    class EmptyDB:
+        def query(self, query, parameters={}):
+            return []
+
+    response = Response()
+
+    assert check_not_modified(make_request(ETAG), response, EmptyDB(), "table_id", "t1") is None
+    assert "etag" not in response.headers
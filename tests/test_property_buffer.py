@@ -0,0 +1,95 @@
+import pytest
+from neo4j.exceptions import ClientError, ServiceUnavailable
+from src.services import property_buffer as module
+from src.services.property_buffer import PropertyWriteBuffer
+
+
+class FakeDB:
+    def __init__(self):
+        self.batches = []
+        self.error = None
+
+    def execute_write(self, query, parameters):
+        rows = parameters["rows"]
+        if self.error:
+            raise self.error
+        for row in rows:
+            if any(isinstance(value, dict) for value in row["properties"].values()):
+                raise ClientError("Property values can only be of primitive types")
+        self.batches.append(rows)
+        return [{"labels": ["Table"], "properties": {"custom_id": row["custom_id"]}} for row in rows]
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def buffer(monkeypatch):
+    db = FakeDB()
+    monkeypatch.setattr(module, "Neo4jConnection", lambda *args: db)
+    # Long interval so only explicit flushes write
+    buffer = PropertyWriteBuffer(flush_interval_ms=60000, max_items=100, max_pending=3)
+    buffer.start()
+    yield buffer
+    buffer.stop()
+
+
+def test_add_without_running_buffer_falls_back():
+    assert PropertyWriteBuffer(200, 100, 100).add("a", {"x": 1}) is None
+
+
+def test_add_merges_updates_per_node(buffer):
+    buffer.add("a", {"x": 1, "y": 1})
+    merged = buffer.add("a", {"x": 2})
+
+    assert merged == {"x": 2, "y": 1}
+    buffer.flush()
+    assert buffer.db.batches == [[{"custom_id": "a", "properties": {"x": 2, "y": 1}}]]
+
+
+def test_add_respects_pending_cap(buffer):
+    for node in ("a", "b", "c"):
+        buffer.add(node, {"x": 1})
+
+    assert buffer.add("d", {"x": 1}) is None
+    # Nodes already pending can still be merged into
+    assert buffer.add("a", {"y": 1}) == {"x": 1, "y": 1}
+
+
+def test_take_removes_pending_update(buffer):
+    buffer.add("a", {"x": 1})
+
+    assert buffer.take("a") == {"x": 1}
+    assert buffer.take("a") == {}
+    buffer.flush()
+    assert buffer.db.batches == []
+
+
+def test_transient_failure_requeues_under_newer_updates(buffer):
+    buffer.add("a", {"x": 1, "y": 1})
+    buffer.db.error = ServiceUnavailable("down")
+    buffer.flush()
+
+    buffer.add("a", {"x": 2})
+    buffer.db.error = None
+    buffer.flush()
+
+    assert buffer.db.batches == [[{"custom_id": "a", "properties": {"x": 2, "y": 1}}]]
+
+
+def test_rejected_row_is_dropped_and_others_written(buffer):
+    buffer.add("good", {"x": 1})
+    buffer.add("bad", {"meta": {"nested": True}})
+    buffer.flush()
+
+    assert buffer.db.batches == [[{"custom_id": "good", "properties": {"x": 1}}]]
+    assert buffer.pending == {}
+
+
+def test_stop_flushes_pending_updates(buffer):
+    db = buffer.db
+    buffer.add("a", {"x": 1})
+    buffer.stop()
+
+    assert db.batches == [[{"custom_id": "a", "properties": {"x": 1}}]]
+    assert not buffer.running
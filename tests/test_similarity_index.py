@@ -0,0 +1,108 @@
+from src.services.similarity_index import SimilarityIndex, vectorize
+
+
+class FakeDB:
+    def __init__(self, records):
+        self.records = records
+
+    def query(self, query, parameters={}):
+        return self.records
+
+
+def make_index(records=()):
+    index = SimilarityIndex("", 256)
+    index.ensure_loaded(FakeDB(list(records)))
+    return index
+
+
+def test_vectorize_is_normalised():
+    vector = vectorize("Product price in USD", 256)
+    assert abs(float((vector ** 2).sum()) - 1.0) < 1e-5
+
+
+def test_search_orders_by_score():
+    index = make_index([
+        {"id": "a", "name": "price", "description": "product price in USD"},
+        {"id": "b", "name": "customer", "description": "customer email address"},
+        {"id": "c", "name": "amount", "description": "price of the order"},
+    ])
+
+    results = index.search("product price", 3)
+
+    assert [result["id"] for result in results][0] == "a"
+    scores = [result["score"] for result in results]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_search_excludes_item():
+    index = make_index([
+        {"id": "a", "name": "price", "description": "product price"},
+        {"id": "b", "name": "cost", "description": "product cost"},
+    ])
+
+    results = index.search("price product price", 2, exclude="a")
+
+    assert [result["id"] for result in results] == ["b"]
+
+
+def test_blank_search_returns_nothing():
+    index = make_index([{"id": "a", "name": "price", "description": "product price"}])
+
+    assert index.search("   ", 5) == []
+
+
+def test_add_before_load_is_ignored():
+    index = SimilarityIndex("", 256)
+    index.add("a", "price", "product price")
+
+    assert index.size == 0
+
+
+def test_add_updates_existing_row():
+    index = make_index([{"id": "a", "name": "price", "description": "product price"}])
+    index.add("a", "email", "customer email")
+
+    assert index.size == 1
+    assert index.search("customer email", 1)[0]["contextual_description"] == "customer email"
+
+
+def test_remove_compacts_rows():
+    index = make_index([{"id": str(i), "name": f"col{i}", "description": f"text {i}"} for i in range(5)])
+
+    index.remove("1")
+
+    assert index.size == 4
+    assert index.ids == ["0", "4", "2", "3"]
+    assert index.rows == {"0": 0, "4": 1, "2": 2, "3": 3}
+    # The moved row keeps its own vector
+    assert (index.matrix[1] == vectorize("col4 text 4", 256)).all()
+    assert index.get("1") is None
+
+
+def test_matrix_grows_past_initial_capacity():
+    index = make_index()
+    for i in range(100):
+        index.add(str(i), f"col{i}", f"text {i}")
+
+    assert index.size == 100
+    assert index.matrix.shape[0] >= 100
+    assert index.search("col99 text 99", 1)[0]["id"] == "99"
+
+
+def test_load_retries_when_writes_race_the_snapshot():
+    index = SimilarityIndex("", 256)
+    calls = []
+
+    class RacingDB:
+        def query(self, query, parameters={}):
+            calls.append(query)
+            if len(calls) == 1:
+                # A delete lands while the first snapshot is being read
+                index.remove("a")
+                return [{"id": "a", "name": "price", "description": "stale"}]
+            return []
+
+    index.ensure_loaded(RacingDB())
+
+    assert len(calls) == 2
+    assert index.get("a") is None
@@ -0,0 +1,40 @@
+from src.services.subgraph_cache import SubgraphCache
+
+
+def test_get_returns_stored_value():
+    cache = SubgraphCache(2)
+    cache.put("a", [1], cache.generation)
+
+    assert cache.get("a") == [1]
+    assert cache.get("b") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_evicts_least_recently_used():
+    cache = SubgraphCache(2)
+    cache.put("a", 1, cache.generation)
+    cache.put("b", 2, cache.generation)
+    cache.get("a")
+    cache.put("c", 3, cache.generation)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_invalidate_clears_entries():
+    cache = SubgraphCache(2)
+    cache.put("a", 1, cache.generation)
+    cache.invalidate()
+
+    assert cache.get("a") is None
+
+
+def test_result_computed_before_invalidation_is_not_stored():
+    cache = SubgraphCache(2)
+    generation = cache.generation
+    # A write lands while the traversal is running
+    cache.invalidate()
+    cache.put("a", 1, generation)
+
+    assert cache.get("a") is None